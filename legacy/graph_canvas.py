@@ -1,13 +1,348 @@
 # graph_canvas.py
 
 import csv
+import hashlib
+import math
+from collections.abc import Mapping
+from contextlib import contextmanager
+from pathlib import Path
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
-from PyQt5.QtWidgets import QMessageBox
-from PyQt5.QtCore import Qt, QPoint
+from scipy.optimize import minimize
+from scipy.sparse.csgraph import shortest_path
+from scipy.spatial import cKDTree
+from PyQt5.QtWidgets import QMessageBox, QProgressDialog
+from PyQt5.QtCore import Qt, QPoint, QTimer, QThread, pyqtSignal
 from PyQt5.QtGui import QCursor
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.patches import Circle, FancyArrowPatch
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.transforms import IdentityTransform
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+#slow layouts are cached on disk, keyed by a hash of the edge list
+LAYOUT_CACHE_DIR = Path.home() / ".cache" / "deeplinkview"
+CACHED_LAYOUTS = ("spring", "kamada_kawai")
+
+#without numba, mid-sized graphs get the L-BFGS spring layout, it keeps (N, N) matrices
+LBFGS_MIN_NODES = 500
+LBFGS_MAX_NODES = 2000
+
+#kamada_kawai of graphs larger than this is computed in a worker thread,
+#spring stays on the GUI thread because numba's tbb layer hangs at exit after use from a QThread
+BACKGROUND_LAYOUTS = ("kamada_kawai",)
+BACKGROUND_LAYOUT_NODES = 200
+
+#dense edge layers are rasterized
+RASTERIZE_EDGES_ABOVE = 2000
+
+#labels are hidden when nodes are on average closer than this on screen,
+#or when more nodes than MAX_VISIBLE_LABELS are in view
+MIN_LABEL_SPACING_PX = 24
+MAX_VISIBLE_LABELS = 200
+
+
+if njit is not None:
+    #not cached on disk: numba keys the cache by the importing module name, so a kernel
+    #cached as graph_canvas fails to load as legacy.graph_canvas
+    @njit(parallel=True, fastmath=True)
+    def _fr_iter(pos, edges, k, t):
+        """One Fruchterman-Reingold step on an (N, 2) float32 array, in place"""
+        n = pos.shape[0]
+        disp = np.zeros_like(pos)
+
+        #repulsion k^2/d between every pair of nodes
+        for i in prange(n):
+            fx = 0.0
+            fy = 0.0
+            for j in range(n):
+                if i != j:
+                    dx = pos[i, 0] - pos[j, 0]
+                    dy = pos[i, 1] - pos[j, 1]
+                    d2 = max(dx * dx + dy * dy, 1e-6)
+                    fx += dx * k * k / d2
+                    fy += dy * k * k / d2
+            disp[i, 0] = fx
+            disp[i, 1] = fy
+
+        #attraction d^2/k along every edge
+        for e in range(edges.shape[0]):
+            u, v = edges[e, 0], edges[e, 1]
+            dx = pos[u, 0] - pos[v, 0]
+            dy = pos[u, 1] - pos[v, 1]
+            d = math.sqrt(dx * dx + dy * dy)
+            disp[u, 0] -= dx * d / k
+            disp[u, 1] -= dy * d / k
+            disp[v, 0] += dx * d / k
+            disp[v, 1] += dy * d / k
+
+        #move each node at most by the temperature t
+        for i in prange(n):
+            length = math.sqrt(disp[i, 0] ** 2 + disp[i, 1] ** 2)
+            if length > 0:
+                step = min(length, t) / length
+                pos[i, 0] += disp[i, 0] * step
+                pos[i, 1] += disp[i, 1] * step
+
+
+def fruchterman_reingold(edges, n_nodes, k=None, iterations=100, init_pos=None):
+    """Force-directed layout of an (E, 2) int edge array, returns (N, 2) in [-1, 1]
+
+    Needs numba; apply_layout falls back to nx.spring_layout without it.
+    """
+    if init_pos is None:
+        pos = np.random.random((n_nodes, 2)).astype(np.float32)
+    else:
+        pos = np.array(init_pos, dtype=np.float32).reshape(n_nodes, 2)
+    edges = np.ascontiguousarray(edges, dtype=np.int32).reshape(-1, 2)
+    if k is None:
+        k = 1 / math.sqrt(max(n_nodes, 1))
+
+    t = 0.1 * max(np.ptp(pos[:, 0]), np.ptp(pos[:, 1]), 1e-3)
+    dt = t / (iterations + 1)
+    for _ in range(iterations):
+        _fr_iter(pos, edges, np.float32(k), np.float32(t))
+        t -= dt
+
+    pos -= pos.mean(axis=0)
+    limit = np.abs(pos).max()
+    if limit > 0:
+        pos /= limit
+    return pos
+
+
+def _read_edges_arrow(filename):
+    """Edges from the first two CSV columns, tokenized by pyarrow's multithreaded reader"""
+    with open(filename, 'r', encoding='utf-8', newline='') as csvfile:
+        header = next(csv.reader(csvfile), None)
+    if not header or len(header) < 2:
+        raise ValueError("CSV file must have at least two columns.")
+
+    #rows with a different column count than the header are skipped by pyarrow,
+    #the row-by-row reader keeps those that still have two columns
+    ragged_rows = []
+    def on_invalid_row(row):
+        if row.actual_columns >= 2:
+            ragged_rows.append(row.number)
+        return 'skip'
+
+    table = pa_csv.read_csv(
+        filename,
+        read_options=pa_csv.ReadOptions(block_size=1 << 20, skip_rows=1,
+                                        column_names=[f"c{i}" for i in range(len(header))]),
+        parse_options=pa_csv.ParseOptions(invalid_row_handler=on_invalid_row),
+        convert_options=pa_csv.ConvertOptions(include_columns=["c0", "c1"],
+                                              column_types={"c0": pa.string(), "c1": pa.string()},
+                                              strings_can_be_null=False))
+    if ragged_rows:
+        return _read_edges_csv(filename)
+
+    source = pc.utf8_trim_whitespace(table.column(0))
+    target = pc.utf8_trim_whitespace(table.column(1))
+    keep = pc.and_(pc.not_equal(source, ''), pc.not_equal(target, ''))
+    return zip(source.filter(keep).to_pylist(), target.filter(keep).to_pylist())
+
+
+def _read_edges_pandas(filename):
+    """Edges from the first two CSV columns, parsed by pandas in one pass"""
+    df = pd.read_csv(filename, header=0, usecols=[0, 1], dtype=str,
+                     keep_default_na=False, skip_blank_lines=True, encoding='utf-8')
+    df = df.apply(lambda column: column.str.strip())
+    df = df[(df.iloc[:, 0] != '') & (df.iloc[:, 1] != '')]
+    return df.itertuples(index=False, name=None)
+
+
+def _read_edges_csv(filename):
+    """Fallback row-by-row reader used when neither pyarrow nor pandas is installed"""
+    edges = []
+    with open(filename, 'r', encoding='utf-8', newline='', buffering=1 << 20) as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, None)
+
+        if not header or len(header) < 2:
+            raise ValueError("CSV file must have at least two columns.")
+
+        for row in reader:
+            if len(row) < 2:
+                continue
+
+            node_a = row[0].strip()
+            node_b = row[1].strip()
+
+            if not node_a or not node_b:
+                continue
+
+            edges.append((node_a, node_b))
+    return edges
+
+
+def read_edges(filename):
+    """(source, target) string pairs from the first two columns of a CSV file"""
+    if pa is not None:
+        return _read_edges_arrow(filename)
+    if pd is not None:
+        return _read_edges_pandas(filename)
+    return _read_edges_csv(filename)
+
+
+def lbfgs_spring_layout(graph, init_pos=None, gravity=0.3, maxiter=200):
+    """Spring layout as a minimum of the Fruchterman-Reingold energy found by L-BFGS
+
+    Repulsion -k^2*log(r) between all pairs, attraction r^3/(3k) along edges and
+    a weak pull towards the origin that keeps components together. Positions
+    are centered and scaled to [-1, 1] like the other layouts.
+    """
+    nodes = list(graph.nodes())
+    n = len(nodes)
+    adjacency = nx.to_scipy_sparse_array(graph, nodelist=nodes, weight=None, format='csr')
+    adjacency = ((adjacency + adjacency.T) > 0).astype(float).toarray()
+    np.fill_diagonal(adjacency, 0)
+    k = 1 / math.sqrt(n)
+    diag = np.arange(n)
+
+    def energy_and_grad(flat):
+        p = flat.reshape(n, 2)
+        sq = (p * p).sum(axis=1)
+        r2 = np.maximum(sq[:, None] + sq[None, :] - 2 * p @ p.T, 1e-9)
+        r2[diag, diag] = 1.0
+        r = np.sqrt(r2)
+        energy = (-0.25 * k * k * np.log(r2).sum() + (adjacency * r2 * r).sum() / (6 * k)
+                  + 0.5 * gravity * sq.sum())
+        coef = adjacency * r / k - k * k / r2
+        coef[diag, diag] = 0
+        grad = coef.sum(axis=1)[:, None] * p - coef @ p + gravity * p
+        return energy, grad.ravel()
+
+    if init_pos is None:
+        p0 = np.random.random((n, 2))
+    else:
+        p0 = np.array(init_pos, dtype=float).reshape(n, 2)
+    result = minimize(energy_and_grad, p0.ravel(), jac=True, method='L-BFGS-B',
+                      options={'maxiter': maxiter})
+    pos = result.x.reshape(n, 2)
+    pos -= pos.mean(axis=0)
+    limit = np.abs(pos).max()
+    if limit > 0:
+        pos /= limit
+    return {node: tuple(xy) for node, xy in zip(nodes, pos)}
+
+
+def spring_layout(graph, warm_pos=None):
+    """Spring layout by the numba solver, or by L-BFGS/networkx when numba is missing"""
+    iterations = 50 if warm_pos else 100
+    if njit is None:
+        if LBFGS_MIN_NODES < len(graph) <= LBFGS_MAX_NODES:
+            init_pos = None
+            if warm_pos and all(node in warm_pos for node in graph):
+                init_pos = [warm_pos[node] for node in graph]
+            return lbfgs_spring_layout(graph, init_pos, maxiter=iterations * 2)
+        return nx.spring_layout(graph, k=0.5, pos=warm_pos, iterations=iterations)
+
+    nodes = list(graph.nodes())
+    node_index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array([(node_index[u], node_index[v]) for u, v in graph.edges()])
+    init_pos = None
+    if warm_pos and all(node in warm_pos for node in nodes):
+        init_pos = [warm_pos[node] for node in nodes]
+    pos = fruchterman_reingold(edges, len(nodes), k=0.5, iterations=iterations,
+                               init_pos=init_pos)
+    return {node: tuple(xy) for node, xy in zip(nodes, pos)}
+
+
+def shortest_path_lengths(graph):
+    """{source: {target: hops}} for all reachable pairs, as expected by kamada_kawai_layout
+
+    The BFS runs in scipy's csgraph on the sparse adjacency matrix instead of
+    networkx's per-source Python loop. Edge direction is respected.
+    """
+    nodes = list(graph.nodes())
+    adjacency = nx.to_scipy_sparse_array(graph, nodelist=nodes, weight=None, format='csr')
+    lengths = shortest_path(adjacency, directed=True, unweighted=True)
+    dist = {}
+    for node, row in zip(nodes, lengths):
+        reachable = np.flatnonzero(np.isfinite(row))
+        dist[node] = dict(zip([nodes[i] for i in reachable], row[reachable].tolist()))
+    return dist
+
+
+def compute_layout(graph, layout_type, warm_pos=None, dist=None):
+    """Node positions of graph for one of the layouts offered in the UI
+
+    Only the requested layout is computed. dist optionally holds precomputed
+    shortest path lengths for kamada_kawai.
+    """
+    layouts = {
+        "spring": lambda: spring_layout(graph, warm_pos),
+        "circular": lambda: nx.circular_layout(graph),
+        "random": lambda: nx.random_layout(graph),
+        "kamada_kawai": lambda: nx.kamada_kawai_layout(graph, dist=dist),
+        "spectral": lambda: nx.spectral_layout(graph)
+    }
+    return layouts.get(layout_type, layouts["spring"])()
+
+
+class NodePositions(Mapping):
+    """Read-only {node: (x, y)} view of the position array of an InteractiveGraph"""
+    def __init__(self, canvas):
+        self._canvas = canvas
+
+    def __getitem__(self, node):
+        return tuple(self._canvas._pos_arr[self._canvas._node_index[node]])
+
+    def __iter__(self):
+        return iter(self._canvas._node_order)
+
+    def __len__(self):
+        return len(self._canvas._node_order)
+
+
+class LayoutWorker(QThread):
+    """Runs compute_layout off the GUI thread
+
+    A requested interruption is checked between the steps; networkx cannot stop
+    inside one, so a stopped worker finishes its current step without emitting.
+    """
+    layout_ready = pyqtSignal(object, object)
+    layout_failed = pyqtSignal(str)
+
+    def __init__(self, graph, layout_type, warm_pos=None, dist=None, parent=None):
+        super().__init__(parent)
+        self.graph = graph
+        self.layout_type = layout_type
+        self.warm_pos = warm_pos
+        self.dist = dist
+
+    def run(self):
+        try:
+            dist = self.dist
+            if self.layout_type == "kamada_kawai" and dist is None:
+                dist = shortest_path_lengths(self.graph)
+            if self.isInterruptionRequested():
+                return
+            pos = compute_layout(self.graph, self.layout_type, warm_pos=self.warm_pos, dist=dist)
+        except Exception as e:
+            if not self.isInterruptionRequested():
+                self.layout_failed.emit(str(e))
+            return
+        if not self.isInterruptionRequested():
+            self.layout_ready.emit(pos, dist)
 
 
 class InteractiveGraph(FigureCanvas):
@@ -23,62 +358,109 @@ class InteractiveGraph(FigureCanvas):
         self.dragging = False
         self.hovered_node = None
         self.node_labels = {}
+        #positions per layout type for the current graph, dropped on load and after a drag
+        self._layout_memo = {}
+        #all-pairs shortest path lengths for kamada_kawai, computed once per graph
+        self._shortest_paths = None
+        #bumped by every apply_layout, results of superseded background layouts are dropped
+        self._layout_generation = 0
+        #the running LayoutWorker, stopped before a new layout starts and when the canvas closes
+        self._layout_worker = None
         self.zoom_level = 1.0
+        self._base_xlim = None
+        self._base_ylim = None
         self.pan_start = None
         self.pan_origin = None
+        #while panning, the background grabbed at pan start is shifted by the mouse offset
+        self._pan_bg = None
+        self._pan_offset = (0, 0)
 
-        self.node_artists = {}
-        self.edge_artists = {}
         self.text_artists = {}
+        #level of detail: when False only the hovered node's label is shown
+        self._labels_visible = True
+        self._lod_label = None
+        #rows of the nodes whose labels are currently shown
+        self._label_shown = np.zeros(0, dtype=bool)
+        self.node_scatter = None
+        self.edge_collection = None
+        self.arrow_collection = None
+        self._edges = []
+        self._edge_index = np.empty((0, 2), dtype=np.int32)
+        self._segments = np.empty((0, 2, 2), dtype=np.float32)
+        self._incident_rows = {}
+        self._node_size = 1.0
+        self._hover_overlay = None
+        self._node_colors = np.empty((0, 4))
+        self._highlight_rows = []
         self.info_text_artist = None
         self.hover_text_artist = None
 
+        #node radius depends only on the view limits and canvas size
+        self._node_radius_data = None
+        self._node_radius_px = None
+
+        #spatial index for hit-testing, None until the next query after positions change
+        self._kdtree = None
+
+        #latest motion event waiting for the next ~60Hz frame
+        self._pending_motion = None
+
+        #redraws are suppressed while > 0, see _batch_draw
+        self._suppress_draw = 0
+
+        #full redraws are coalesced to at most one per ~16 ms frame
+        self._redraw_pending = False
+
+        #blitting: cached axes background and artists drawn on top of it
+        self._bg = None
+        self._drag_artists = []
+        self._drag_rows = None
+
+        self.mpl_connect('draw_event', self.on_draw)
         self.mpl_connect('button_press_event', self.on_press)
         self.mpl_connect('button_release_event', self.on_release)
         self.mpl_connect('motion_notify_event', self.on_motion)
         self.mpl_connect('scroll_event', self.on_scroll)
+        self.mpl_connect('resize_event', self._invalidate_radius)
+        self.mpl_connect('resize_event', self._invalidate_background)
+        self._connect_axes_callbacks()
 
         self.ax.set_facecolor('black')
         self.fig.set_facecolor('black')
         self.ax.axis('off')
         self.draw_idle()
 
+    @property
+    def pos(self):
+        """Node positions as a {node: (x, y)} mapping backed by self._pos_arr"""
+        return NodePositions(self)
+
+    @pos.setter
+    def pos(self, positions):
+        #positions live in one (N, 2) array, row i belongs to self._node_order[i]
+        self._node_order = list(positions)
+        self._node_index = {node: i for i, node in enumerate(self._node_order)}
+        self._pos_arr = np.array([positions[n] for n in self._node_order],
+                                 dtype=np.float32).reshape(-1, 2)
+
     def load_graph_from_csv(self, filename):
         self.graph.clear()
         self.pos = {}
         self.node_labels = {}
+        self._layout_memo = {}
+        self._shortest_paths = None
+        self._layout_generation += 1
+        self.stop_layout_worker()
         self.clear_artists()
 
         try:
-            with open(filename, 'r', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                header = next(reader, None)
-                
-                if not header or len(header) < 2:
-                    raise ValueError("CSV file must have at least two columns.")
-                
-                for row in reader:
-                    if len(row) < 2:
-                        continue
-
-                    node_a = row[0].strip()
-                    node_b = row[1].strip()
-                    
-                    if not node_a or not node_b:
-                        continue
-
-                    self.graph.add_edge(node_a, node_b)
-                    self.node_labels[node_a] = node_a
-                    self.node_labels[node_b] = node_b
+            self.graph.add_edges_from(read_edges(filename))
+            self.node_labels = {node: node for node in self.graph.nodes}
 
             if not self.graph.nodes:
                 raise ValueError("No valid edges found in the CSV file.")
 
             self.apply_layout("spring")
-            self.auto_scale()
-            self.create_artists()
-            self.update_artists()
-            self.draw()
             return True
         except Exception as e:
             print(f"Error loading graph: {e}")
@@ -90,109 +472,282 @@ class InteractiveGraph(FigureCanvas):
             return False
 
     def clear_artists(self):
-        self.ax.clear()
-        self.node_artists.clear()
-        self.edge_artists.clear()
+        #only the graph artists are removed, the axes keep their limits, callbacks and axis('off')
+        for artist in list(self.ax.collections) + list(self.ax.texts):
+            artist.remove()
         self.text_artists.clear()
+        self._labels_visible = True
+        self._lod_label = None
+        self._label_shown = np.zeros(0, dtype=bool)
+        self.node_scatter = None
+        self._hover_overlay = None
+        self.edge_collection = None
+        self.arrow_collection = None
         self.info_text_artist = None
         self.hover_text_artist = None
-        self.ax.axis('off')
+        self._drag_artists = []
+        self._drag_rows = None
+        self._bg = None
 
     def apply_layout(self, layout_type):
         if not self.graph.nodes:
             return
         
-        layouts = {
-            "spring": nx.spring_layout(self.graph, k=0.5, iterations=100),
-            "circular": nx.circular_layout(self.graph),
-            "random": nx.random_layout(self.graph),
-            "kamada_kawai": nx.kamada_kawai_layout(self.graph),
-            "spectral": nx.spectral_layout(self.graph)
-        }
-        self.pos = layouts.get(layout_type, nx.spring_layout(self.graph))
-        
-        self.clear_artists()
-        self.auto_scale()
-        self.create_artists()
-        self.update_artists()
-        self.draw()
+        self._layout_generation += 1
+        self.stop_layout_worker()
 
-    def auto_scale(self):
-        if not self.pos:
+        if layout_type in self._layout_memo:
+            self._node_order, self._node_index, pos_arr = self._layout_memo[layout_type]
+            self._pos_arr = pos_arr.copy()
+            self._show_layout()
             return
 
-        all_x = [pos[0] for pos in self.pos.values()]
-        all_y = [pos[1] for pos in self.pos.values()]
+        #spring warm-starts from the current, possibly dragged, positions; a stored
+        #layout would silently replace them, so it is neither read nor written then
+        warm_start = layout_type == "spring" and len(self.pos) > 0
+        cache_path = (self._layout_cache_path(layout_type)
+                      if layout_type in CACHED_LAYOUTS and not warm_start else None)
+        cached_pos = self._load_cached_layout(cache_path) if cache_path else None
+        if cached_pos is not None:
+            self._set_layout(layout_type, cached_pos)
+        elif layout_type in BACKGROUND_LAYOUTS and len(self.graph) > BACKGROUND_LAYOUT_NODES:
+            self._start_layout_worker(layout_type, cache_path)
+        else:
+            dist = None
+            if layout_type == "kamada_kawai":
+                if self._shortest_paths is None:
+                    self._shortest_paths = shortest_path_lengths(self.graph)
+                dist = self._shortest_paths
+            #re-applying a layout starts from the current positions and needs fewer iterations
+            pos = compute_layout(self.graph, layout_type, warm_pos=self.pos or None, dist=dist)
+            self._set_layout(layout_type, pos, cache_path)
+
+    def _set_layout(self, layout_type, pos, cache_path=None):
+        """Take over the positions of a freshly computed layout and show them"""
+        self.pos = pos
+        if cache_path:
+            self._save_cached_layout(cache_path)
+        self._layout_memo[layout_type] = (self._node_order, self._node_index, self._pos_arr.copy())
+        self._show_layout()
+
+    def _show_layout(self):
+        self._invalidate_radius()
+        self._kdtree = None
+
+        #one full update pass, drawn once when the batch exits
+        with self._batch_draw():
+            self.clear_artists()
+            self.create_artists()
+            self._compute_limits()
+            self.update_artists()
+
+    def _start_layout_worker(self, layout_type, cache_path):
+        """Compute a slow layout in a LayoutWorker behind a busy progress dialog"""
+        generation = self._layout_generation
+        dist = self._shortest_paths if layout_type == "kamada_kawai" else None
+        worker = LayoutWorker(self.graph.copy(), layout_type, warm_pos=dict(self.pos) or None,
+                              dist=dist, parent=self)
+        progress = QProgressDialog(f"Computing {layout_type} layout...", "Cancel", 0, 0, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
 
-        if not all_x or not all_y:
+        def on_ready(pos, dist):
+            if generation != self._layout_generation or worker.isInterruptionRequested():
+                return
+            if dist is not None:
+                self._shortest_paths = dist
+            self._set_layout(layout_type, pos, cache_path)
+
+        def on_failed(message):
+            print(f"Error computing layout: {message}")
+            QMessageBox.warning(self.parent(), "Error", f"Failed to compute {layout_type} layout: {message}")
+
+        def on_finished():
+            #closing the dialog emits canceled, which must not reach the worker
+            progress.canceled.disconnect()
+            progress.close()
+            if self._layout_worker is worker:
+                self._layout_worker = None
+            worker.deleteLater()
+
+        worker.layout_ready.connect(on_ready)
+        worker.layout_failed.connect(on_failed)
+        worker.finished.connect(on_finished)
+        #the current view stays, the worker finishes its step in the background
+        progress.canceled.connect(worker.requestInterruption)
+        self._layout_worker = worker
+        worker.start()
+        progress.show()
+
+    def stop_layout_worker(self):
+        """Interrupt the running layout worker and wait for its thread to end"""
+        worker, self._layout_worker = self._layout_worker, None
+        if worker is not None:
+            worker.requestInterruption()
+            worker.quit()
+            worker.wait()
+
+    def closeEvent(self, event):
+        #a QThread destroyed with its parent while running aborts the process
+        self.stop_layout_worker()
+        super().closeEvent(event)
+
+    def _layout_cache_path(self, layout_type):
+        edges = repr(sorted(self.graph.edges(), key=str)).encode()
+        key = hashlib.blake2b(edges).hexdigest()[:16]
+        return LAYOUT_CACHE_DIR / f"{layout_type}_{key}.npz"
+
+    def _load_cached_layout(self, path):
+        """Positions stored for this graph, or None if there is no usable cache entry"""
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                names, coords = data['nodes'], data['coords']
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Ignoring layout cache {path}: {e}")
+            return None
+
+        nodes_by_name = {str(node): node for node in self.graph.nodes}
+        if len(names) != len(nodes_by_name) or not all(str(n) in nodes_by_name for n in names):
+            return None
+        return {nodes_by_name[str(n)]: tuple(xy) for n, xy in zip(names, coords)}
+
+    def _save_cached_layout(self, path):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(path, nodes=np.array([str(n) for n in self._node_order]),
+                     coords=self._pos_arr.astype(float))
+        except OSError as e:
+            print(f"Could not save layout cache {path}: {e}")
+
+    def auto_scale(self):
+        """Fit the view to the graph and redraw"""
+        if not len(self._pos_arr):
             return
+        self._compute_limits()
+        self.update_artists()
+
+    def _compute_limits(self):
+        """Set the view limits to the padded layout extent without redrawing"""
+        x_min, y_min = self._pos_arr.min(axis=0)
+        x_max, y_max = self._pos_arr.max(axis=0)
 
-        x_min, x_max = min(all_x), max(all_x)
-        y_min, y_max = min(all_y), max(all_y)
-        
         x_range = x_max - x_min
         y_range = y_max - y_min
 
         x_padding = max(0.2, x_range * 0.3) if x_range > 0 else 0.5
         y_padding = max(0.2, y_range * 0.3) if y_range > 0 else 0.5
 
-        self.ax.set_xlim(x_min - x_padding, x_max + x_padding)
-        self.ax.set_ylim(y_min - y_padding, y_max + y_padding)
+        #limits at zoom level 1.0, set_zoom scales these instead of re-deriving them
+        self._base_xlim = (x_min - x_padding, x_max + x_padding)
+        self._base_ylim = (y_min - y_padding, y_max + y_padding)
+        self.ax.set_xlim(self._base_xlim)
+        self.ax.set_ylim(self._base_ylim)
         self.zoom_level = 1.0
-        self.ax.axis('off')
+
+    def set_zoom(self, zoom_level):
+        """Zoom to zoom_level relative to the auto-scaled view, keeping the current center"""
+        if self._base_xlim is None:
+            return
+        xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
+        center_x = (xlim[0] + xlim[1]) / 2
+        center_y = (ylim[0] + ylim[1]) / 2
+        width = (self._base_xlim[1] - self._base_xlim[0]) / zoom_level
+        height = (self._base_ylim[1] - self._base_ylim[0]) / zoom_level
+        self.ax.set_xlim(center_x - width/2, center_x + width/2)
+        self.ax.set_ylim(center_y - height/2, center_y + height/2)
+        self.zoom_level = zoom_level
         self.update_artists()
-        self.draw()
 
     def create_artists(self):
-        """Создаём графические элементы без текстовых меток"""
-        for link_id in self.links:
-            self._create_link_artist(link_id)
+        """Создаём графические элементы узлов, рёбер и подписей"""
+        self._edges = list(self.graph.edges())
+        self._edge_index = np.array(
+            [(self._node_index[u], self._node_index[v]) for u, v in self._edges],
+            dtype=np.int32).reshape(-1, 2)
+        #rows of the edge arrays touching each node, so a drag only rewrites those
+        rows_by_node = [[] for _ in self._node_index]
+        for row, (u, v) in enumerate(self._edge_index):
+            rows_by_node[u].append(row)
+            if v != u:
+                rows_by_node[v].append(row)
+        self._incident_rows = {node: np.array(rows_by_node[i], dtype=int)
+                               for node, i in self._node_index.items()}
+        self._segments = np.empty((len(self._edges), 2, 2), dtype=np.float32)
+        #all edges are drawn by one line collection and one arrowhead collection
+        self.edge_collection, self.arrow_collection = self._add_edge_collections(len(self._edges))
+        if len(self._edges) > RASTERIZE_EDGES_ABOVE:
+            self.edge_collection.set_rasterized(True)
+            self.arrow_collection.set_rasterized(True)
+
+        #all nodes are drawn by one scatter, sizes and colors are set in update_artists
+        pos_arr = self._pos_arr
+        self._node_colors = np.tile(to_rgba('#888888'), (len(pos_arr), 1))
+        self._highlight_rows = []
+        self.node_scatter = self.ax.scatter(
+            pos_arr[:, 0], pos_arr[:, 1], s=self._node_size, c=self._node_colors,
+            edgecolors='white', linewidths=1, zorder=2)
+        #hovered nodes are blitted on top of the background by this overlay
+        self._hover_overlay = self.ax.scatter(
+            [], [], s=self._node_size, edgecolors='white', linewidths=1,
+            zorder=2, animated=True)
+
+        for node, (x, y) in zip(self._node_index, pos_arr):
+            self.text_artists[node] = self.ax.text(
+                x, y, self.node_labels.get(node, str(node)),
+                ha='center', va='center', fontsize=8, color='white', zorder=3)
+        self._label_shown = np.ones(len(pos_arr), dtype=bool)
+
+        self.info_text_artist = self.ax.text(
+            0.01, 0.99, "", transform=self.ax.transAxes,
+            ha='left', va='top', fontsize=9, color='white', zorder=4,
+            animated=True)
+        #the overlay texts are never part of the background, so a pan blit does not shift them
+        self.hover_text_artist = self.ax.text(
+            0.01, 0.01, "", transform=self.ax.transAxes,
+            ha='left', va='bottom', fontsize=9, color='white', zorder=4,
+            animated=True)
 
     def update_artists(self, changed_node=None):
         if not self.graph.nodes:
             self.ax.text(0.5, 0.5, "No graph loaded", ha='center', va='center', fontsize=12, color='white')
-            self.ax.axis('off')
-            self.draw()
+            self._maybe_draw()
             return
 
-        xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
-        if (xlim[1] - xlim[0]) == 0 or (ylim[1] - ylim[0]) == 0:
-            node_radius_in_data_units = 0.05
-        else:
-            fig_width_inches, fig_height_inches = self.fig.get_size_inches()
-            dpi = self.fig.dpi
-            data_units_per_inch_x = (xlim[1] - xlim[0]) / fig_width_inches
-            data_units_per_inch_y = (ylim[1] - ylim[0]) / fig_height_inches
-            node_radius_in_data_units = 15.0 / dpi * ((data_units_per_inch_x + data_units_per_inch_y) / 2)
-
-        nodes_to_update = [changed_node] if changed_node else list(self.graph.nodes())
-        edges_to_update = set()
-
-        if changed_node:
-            edges_to_update.update(self.graph.in_edges(changed_node))
-            edges_to_update.update(self.graph.out_edges(changed_node))
-        else:
-            edges_to_update.update(self.graph.edges())
-
-        for edge in edges_to_update:
-            if edge in self.edge_artists:
-                x1, y1 = self.pos.get(edge[0], (0,0))
-                x2, y2 = self.pos.get(edge[1], (0,0))
-                self.edge_artists[edge].set_positions((x1, y1), (x2, y2))
-                
-        for node in nodes_to_update:
-            if node in self.node_artists:
-                x, y = self.pos.get(node, (0,0))
-                self.node_artists[node].set_center((x, y))
-                self.node_artists[node].set_radius(node_radius_in_data_units)
-
-                color = '#888888'
-                if node == self.selected_node: color = '#aaaaaa'
-                elif node == self.hovered_node: color = '#cccccc'
-                self.node_artists[node].set_facecolor(color)
-
-                self.text_artists[node].set_position((x, y))
-                self.text_artists[node].set_text(self.node_labels.get(node, str(node)))
+        self._get_node_radius()
+        radius_px = self._node_radius_px
+        #scatter sizes are marker areas in points^2
+        self._node_size = (2 * radius_px * 72 / self.fig.dpi) ** 2
+
+        if not changed_node and self.node_scatter:
+            pos_arr = self._pos_arr
+            #one gather writes all (E, 2, 2) edge end points into the preallocated buffer
+            segs = np.take(pos_arr, self._edge_index, axis=0, out=self._segments)
+            offsets = pos_arr
+            if self._drag_rows is not None:
+                segs, offsets = segs.copy(), offsets.copy()
+                segs[self._drag_rows] = np.nan
+                offsets[self._node_index[self.selected_node]] = np.nan
+            self._set_edge_geometry(self.edge_collection, self.arrow_collection, segs, radius_px)
+
+            self._refresh_node_colors()
+            self.node_scatter.set_offsets(offsets)
+            self.node_scatter.set_sizes([self._node_size])
+
+            self._update_labels(pos_arr)
+
+        if self._drag_rows is not None:
+            rows = self._drag_rows
+            i = self._node_index[self.selected_node]
+            position = self._pos_arr[i]
+            self._segments[rows[self._edge_index[rows, 0] == i], 0] = position
+            self._segments[rows[self._edge_index[rows, 1] == i], 1] = position
+            lines, heads, drag_node, drag_text = self._drag_artists
+            self._set_edge_geometry(lines, heads, self._segments[rows], radius_px)
+            drag_node.set_offsets([position])
+            drag_node.set_sizes([self._node_size])
+            drag_text.set_position(position)
 
         if self.info_text_artist:
             self.info_text_artist.set_text(f"Nodes: {len(self.graph.nodes)} | Edges: {len(self.graph.edges)}")
@@ -204,24 +759,248 @@ class InteractiveGraph(FigureCanvas):
             else:
                 self.hover_text_artist.set_visible(False)
 
-        self.ax.axis('off')
-        self.fig.canvas.draw_idle()
+        if changed_node and self._drag_artists:
+            self._blit(self._drag_artists)
+        else:
+            self._maybe_draw()
 
-    def get_node_at_position(self, pos):
-        if not pos[0] or not pos[1]: return None
-        x, y = pos
+    @contextmanager
+    def _batch_draw(self):
+        """Suppress redraws inside the block and draw once when it exits"""
+        self._suppress_draw += 1
+        try:
+            yield
+        finally:
+            self._suppress_draw -= 1
+            if not self._suppress_draw:
+                self.draw()
+
+    def _maybe_draw(self):
+        if not self._suppress_draw:
+            self._schedule_redraw()
+
+    def _schedule_redraw(self):
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            QTimer.singleShot(16, self._do_redraw)
+
+    def _do_redraw(self):
+        self._redraw_pending = False
+        FigureCanvas.draw_idle(self)
+
+    def on_draw(self, event):
+        """Re-grab the background after every full draw"""
+        self._bg = self.copy_from_bbox(self.ax.bbox)
+        for artist in self._drag_artists:
+            self.ax.draw_artist(artist)
+        if self._lod_label and self._lod_label not in self._drag_artists:
+            self.ax.draw_artist(self._lod_label)
+        self._draw_overlay_text()
+
+    def _draw_overlay_text(self):
+        for artist in (self.info_text_artist, self.hover_text_artist):
+            if artist:
+                self.ax.draw_artist(artist)
+
+    def _blit(self, artists):
+        """Restore the cached background and redraw only the given artists"""
+        if self._bg is None:
+            self._schedule_redraw()
+            return
+        self.restore_region(self._bg)
+        for artist in artists:
+            self.ax.draw_artist(artist)
+        if self._lod_label and self._lod_label not in artists:
+            self.ax.draw_artist(self._lod_label)
+        self._draw_overlay_text()
+        self.blit(self.ax.bbox)
+
+    def _node_color(self, node):
+        if node == self.selected_node: return '#aaaaaa'
+        if node == self.hovered_node: return '#cccccc'
+        return '#888888'
+
+    def _refresh_node_colors(self):
+        """Reset the previously highlighted rows and color the hovered/selected node"""
+        self._node_colors[self._highlight_rows] = to_rgba('#888888')
+        self._highlight_rows = []
+        for node in (self.hovered_node, self.selected_node):
+            if node in self._node_index:
+                i = self._node_index[node]
+                self._node_colors[i] = to_rgba(self._node_color(node))
+                self._highlight_rows.append(i)
+        self.node_scatter.set_facecolors(self._node_colors)
+
+    def _add_edge_collections(self, n_edges, animated=False):
+        """Line and arrowhead collections for n_edges edges"""
+        lines = LineCollection(np.zeros((n_edges, 2, 2)), colors='#666666',
+                               linewidths=1, zorder=1, animated=animated)
+        #arrowheads are drawn in pixels at the edge end points, so they keep their size on zoom
+        heads = PolyCollection(np.zeros((n_edges, 3, 2)), offsets=np.zeros((n_edges, 2)),
+                               offset_transform=self.ax.transData, facecolors='#666666',
+                               edgecolors='none', zorder=1, animated=animated)
+        heads.set_transform(IdentityTransform())
+        self.ax.add_collection(lines, autolim=False)
+        self.ax.add_collection(heads, autolim=False)
+        return lines, heads
+
+    def _set_edge_geometry(self, lines, heads, segs, radius_px):
+        """Update edge segments and the arrowheads at their ends"""
+        screen = self.ax.transData.transform(segs.reshape(-1, 2)).reshape(-1, 2, 2)
+        direction = screen[:, 1] - screen[:, 0]
+        length = np.hypot(direction[:, 0], direction[:, 1])
+        length[length == 0] = np.inf
+        ux, uy = direction[:, 0] / length, direction[:, 1] / length
+
+        px_per_point = self.fig.dpi / 72
+        tip = -radius_px
+        base = tip - 7 * px_per_point
+        half_width = 3 * px_per_point
+        verts = np.empty((len(segs), 3, 2))
+        verts[:, 0, 0], verts[:, 0, 1] = ux * tip, uy * tip
+        verts[:, 1, 0], verts[:, 1, 1] = ux * base - uy * half_width, uy * base + ux * half_width
+        verts[:, 2, 0], verts[:, 2, 1] = ux * base + uy * half_width, uy * base - ux * half_width
+
+        lines.set_segments(segs)
+        heads.set_verts(verts)
+        heads.set_offsets(segs[:, 1])
+
+    def _start_drag(self, node):
+        """Move the dragged node and its edges out of the background"""
+        #the cached background still shows the node, drag blits wait for the next redraw
+        self._bg = None
+        self._drag_rows = self._incident_rows[node]
+        lines, heads = self._add_edge_collections(len(self._drag_rows), animated=True)
+        drag_node = self.ax.scatter(
+            [], [], s=self._node_size, c=self._node_color(node), edgecolors='white',
+            linewidths=1, zorder=2, animated=True)
+        self._show_lod_label(None)
+        self._drag_artists = [lines, heads, drag_node, self.text_artists[node]]
+        self.text_artists[node].set_animated(True)
+        self.text_artists[node].set_visible(True)
+
+    def _stop_drag(self):
+        if self._drag_artists:
+            for artist in self._drag_artists[:3]:
+                artist.remove()
+            self._drag_artists[3].set_animated(False)
+            self._drag_artists[3].set_visible(self._label_shown[self._node_index[self.selected_node]])
+        self._drag_artists = []
+        self._drag_rows = None
+        self._show_lod_label(self.hovered_node)
+
+    def _set_hovered_node(self, node):
+        """Recolor the previous and the new hovered node and blit them"""
+        old_node, self.hovered_node = self.hovered_node, node
+        nodes = [n for n in (old_node, node) if n in self._node_index]
+        changed = []
+        if nodes:
+            self._refresh_node_colors()
+            self._hover_overlay.set_offsets(self._pos_arr[[self._node_index[n] for n in nodes]])
+            self._hover_overlay.set_facecolors([self._node_color(n) for n in nodes])
+            self._hover_overlay.set_sizes([self._node_size])
+            self._show_lod_label(node)
+            changed = [self._hover_overlay] + [self.text_artists[n] for n in nodes]
+
+        if self.hover_text_artist:
+            if node:
+                self.hover_text_artist.set_text(f"Hovered: {node}")
+                self.hover_text_artist.set_visible(True)
+            else:
+                self.hover_text_artist.set_visible(False)
+        self._blit(changed)
+
+    def _label_spacing_px(self, pos_arr):
+        """Average on-screen distance between nodes, from the layout extent in pixels"""
         xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
-        if (xlim[1] - xlim[0]) == 0 or (ylim[1] - ylim[0]) == 0: return None
+        if not len(pos_arr) or xlim[1] == xlim[0] or ylim[1] == ylim[0]:
+            return math.inf
+        extent = np.ptp(pos_arr, axis=0)
+        width_px = extent[0] * self.ax.bbox.width / abs(xlim[1] - xlim[0])
+        height_px = extent[1] * self.ax.bbox.height / abs(ylim[1] - ylim[0])
+        return math.sqrt(max(width_px, 1.0) * max(height_px, 1.0) / len(pos_arr))
+
+    def _update_labels(self, pos_arr):
+        """Show the labels of the nodes in view, or none if there are too many or they overlap"""
+        x0, x1 = sorted(self.ax.get_xlim())
+        y0, y1 = sorted(self.ax.get_ylim())
+        in_view = ((pos_arr[:, 0] >= x0) & (pos_arr[:, 0] <= x1) &
+                   (pos_arr[:, 1] >= y0) & (pos_arr[:, 1] <= y1))
+        labels_visible = (np.count_nonzero(in_view) <= MAX_VISIBLE_LABELS and
+                          self._label_spacing_px(pos_arr) >= MIN_LABEL_SPACING_PX)
+        if not labels_visible:
+            in_view[:] = False
 
-        fig_width_inches, fig_height_inches = self.fig.get_size_inches()
-        dpi = self.fig.dpi
-        data_units_per_inch_x = (xlim[1] - xlim[0]) / fig_width_inches
-        data_units_per_inch_y = (ylim[1] - ylim[0]) / fig_height_inches
-        node_radius_in_data_units = 15.0 / dpi * ((data_units_per_inch_x + data_units_per_inch_y) / 2)
+        self._show_lod_label(None)
+        self._labels_visible = labels_visible
+        #only labels entering or leaving the view are toggled, only shown ones are moved
+        for i in np.flatnonzero(in_view != self._label_shown):
+            self.text_artists[self._node_order[i]].set_visible(in_view[i])
+        for i in np.flatnonzero(in_view):
+            self.text_artists[self._node_order[i]].set_position(pos_arr[i])
+        self._label_shown = in_view
+        if not labels_visible:
+            self._show_lod_label(self.hovered_node)
 
-        for node, (nx_pos, ny_pos) in self.pos.items():
-            if ((nx_pos - x)**2 + (ny_pos - y)**2) <= node_radius_in_data_units**2:
-                return node
+    def _show_lod_label(self, node):
+        """While labels are hidden, blit only the label of node on top of the background"""
+        if self._lod_label is not None:
+            self._lod_label.set_visible(False)
+            self._lod_label.set_animated(False)
+            self._lod_label = None
+        if not self._labels_visible and node in self.text_artists and not self._drag_artists:
+            label = self.text_artists[node]
+            label.set_position(self._pos_arr[self._node_index[node]])
+            label.set_animated(True)
+            label.set_visible(True)
+            self._lod_label = label
+
+    def _connect_axes_callbacks(self):
+        self.ax.callbacks.connect('xlim_changed', self._invalidate_radius)
+        self.ax.callbacks.connect('ylim_changed', self._invalidate_radius)
+        #new limits make the cached background stale until the next full draw
+        self.ax.callbacks.connect('xlim_changed', self._invalidate_background)
+        self.ax.callbacks.connect('ylim_changed', self._invalidate_background)
+
+    def _invalidate_background(self, *args):
+        self._bg = None
+
+    def _invalidate_radius(self, *args):
+        self._node_radius_data = None
+        self._node_radius_px = None
+
+    def _get_node_radius(self):
+        """Node radius in data units, cached until the view or canvas size changes"""
+        if self._node_radius_data is None:
+            xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
+            if (xlim[1] - xlim[0]) == 0 or (ylim[1] - ylim[0]) == 0:
+                self._node_radius_data = 0.05
+                self._node_radius_px = 0.0
+            else:
+                fig_width_inches, fig_height_inches = self.fig.get_size_inches()
+                dpi = self.fig.dpi
+                data_units_per_inch_x = (xlim[1] - xlim[0]) / fig_width_inches
+                data_units_per_inch_y = (ylim[1] - ylim[0]) / fig_height_inches
+                self._node_radius_data = 15.0 / dpi * ((data_units_per_inch_x + data_units_per_inch_y) / 2)
+                self._node_radius_px = self._node_radius_data * self.ax.bbox.width / (xlim[1] - xlim[0])
+        return self._node_radius_data
+
+    def _build_kdtree(self):
+        if len(self._pos_arr):
+            #an unbalanced tree builds faster and the index is rebuilt after every drag
+            self._kdtree = cKDTree(self._pos_arr, balanced_tree=False, compact_nodes=False)
+        else:
+            self._kdtree = None
+
+    def get_node_at_position(self, pos):
+        if pos[0] is None or pos[1] is None: return None
+        if self._kdtree is None:
+            self._build_kdtree()
+            if self._kdtree is None: return None
+        #nodes farther than one radius are pruned inside the tree search
+        distance, i = self._kdtree.query(pos, distance_upper_bound=self._get_node_radius())
+        if i < len(self._node_order):
+            return self._node_order[i]
         return None
 
     def on_press(self, event):
@@ -231,58 +1010,95 @@ class InteractiveGraph(FigureCanvas):
             if node:
                 self.selected_node = node
                 self.dragging = True
+                self._start_drag(node)
                 self.update_artists()
-                self.fig.canvas.draw_idle()
             else:
                 self.pan_start = QPoint(event.x, event.y)
                 self.pan_origin = (self.ax.get_xlim(), self.ax.get_ylim())
+                self._pan_bg = self.copy_from_bbox(self.ax.bbox)
+                self._pan_offset = (0, 0)
                 self.setCursor(QCursor(Qt.ClosedHandCursor))
 
     def on_release(self, event):
         if event.button == 1:
+            self._flush_motion()
+            if self.dragging:
+                #only the dragged node moved, the index is rebuilt on the next hit-test
+                self._kdtree = None
+                self._layout_memo = {}
+            if self.pan_start and self._pan_offset != (0, 0):
+                self._apply_pan(*self._pan_offset)
+            self._stop_drag()
             self.dragging = False
             self.selected_node = None
             self.pan_start = None
             self.pan_origin = None
+            self._pan_bg = None
             self.setCursor(QCursor(Qt.ArrowCursor))
             self.update_artists()
-            self.fig.canvas.draw_idle()
 
     def on_motion(self, event):
-        if event.inaxes != self.ax:
-            if self.hovered_node:
-                self.hovered_node = None
-                self.update_artists()
-                self.fig.canvas.draw_idle()
-            return
+        """Coalesce motion events so at most one is handled per ~16 ms frame"""
+        if self._pending_motion is None:
+            QTimer.singleShot(16, self._flush_motion)
+        self._pending_motion = event
 
+    def _flush_motion(self):
+        event, self._pending_motion = self._pending_motion, None
+        if event is not None:
+            self._do_motion(event)
+
+    def _do_motion(self, event):
+        #pick the handler from the interaction state first, only hover needs a hit-test
         if self.pan_start and event.button == 1:
-            if event.xdata is None or event.ydata is None: return
-            dx_pixels, dy_pixels = event.x - self.pan_start.x(), event.y - self.pan_start.y()
-            xlim_current, ylim_current = self.ax.get_xlim(), self.ax.get_ylim()
-            fig_width_inches, fig_height_inches = self.fig.get_size_inches()
-            dpi = self.fig.dpi
-            if fig_width_inches == 0 or fig_height_inches == 0: return
-            x_data_per_pixel = (xlim_current[1] - xlim_current[0]) / (fig_width_inches * dpi)
-            y_data_per_pixel = (ylim_current[1] - ylim_current[0]) / (fig_height_inches * dpi)
-            dx_data, dy_data = dx_pixels * x_data_per_pixel, dy_pixels * y_data_per_pixel
-            new_xlim = (self.pan_origin[0][0] - dx_data, self.pan_origin[0][1] - dx_data)
-            new_ylim = (self.pan_origin[1][0] + dy_data, self.pan_origin[1][1] + dy_data)
-            self.ax.set_xlim(new_xlim)
-            self.ax.set_ylim(new_ylim)
-            self.fig.canvas.draw_idle()
+            self._on_motion_pan(event)
+        elif self.dragging and self.selected_node:
+            self._on_motion_drag(event)
+        else:
+            self._on_motion_hover(event)
+
+    def _on_motion_pan(self, event):
+        #the limits are only changed on release, until then the pan is a shifted blit
+        self._pan_offset = (event.x - self.pan_start.x(), event.y - self.pan_start.y())
+        self._blit_pan(*self._pan_offset)
+
+    def _on_motion_drag(self, event):
+        if event.inaxes != self.ax or event.xdata is None or event.ydata is None:
             return
+        self._pos_arr[self._node_index[self.selected_node]] = (event.xdata, event.ydata)
+        self.update_artists(changed_node=self.selected_node)
 
+    def _on_motion_hover(self, event):
+        if event.inaxes != self.ax:
+            if self.hovered_node:
+                self._set_hovered_node(None)
+            return
         node = self.get_node_at_position((event.xdata, event.ydata))
         if node != self.hovered_node:
-            self.hovered_node = node
-            self.update_artists()
-            self.fig.canvas.draw_idle()
+            self._set_hovered_node(node)
 
-        if self.dragging and self.selected_node and event.xdata is not None and event.ydata is not None:
-            self.pos[self.selected_node] = (event.xdata, event.ydata)
-            self.update_artists(changed_node=self.selected_node)
-            self.fig.canvas.draw_idle()
+    #links_canvas.InteractiveLinksCanvas has its own copy, legacy/ stays standalone
+    def _blit_pan(self, dx, dy):
+        """Show the pan by shifting the pixels grabbed at pan start by (dx, dy)"""
+        if self._pan_bg is None:
+            return
+        self.fig.draw_artist(self.fig.patch)
+        #region extents are in buffer pixels with y pointing down
+        x0, y0, _, _ = self._pan_bg.get_extents()
+        self.restore_region(self._pan_bg, xy=(x0 + dx, y0 - dy))
+        self._draw_overlay_text()
+        self.blit(self.ax.bbox)
+
+    def _apply_pan(self, dx, dy):
+        """Move the view limits by a pan of (dx, dy) pixels from the pan origin"""
+        (x0, x1), (y0, y1) = self.pan_origin
+        bbox = self.ax.bbox
+        if not bbox.width or not bbox.height:
+            return
+        dx_data = dx * (x1 - x0) / bbox.width
+        dy_data = dy * (y1 - y0) / bbox.height
+        self.ax.set_xlim(x0 - dx_data, x1 - dx_data)
+        self.ax.set_ylim(y0 - dy_data, y1 - dy_data)
 
     def on_scroll(self, event):
         if event.inaxes != self.ax: return
@@ -295,5 +1111,4 @@ class InteractiveGraph(FigureCanvas):
         new_height = (ylim[1] - ylim[0]) / zoom_factor_scroll
         self.ax.set_xlim(mouse_x - new_width/2, mouse_x + new_width/2)
         self.ax.set_ylim(mouse_y - new_height/2, mouse_y + new_height/2)
-        self.update_artists()
-        self.fig.canvas.draw_idle()
\ No newline at end of file
+        self.update_artists()
\ No newline at end of file
@@ -0,0 +1,179 @@
+# pyqtgraph_canvas.py
+
+import networkx as nx
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtWidgets import QMessageBox
+from PyQt5.QtCore import Qt, QPointF
+
+try:
+    from .graph_canvas import read_edges, compute_layout
+except ImportError:
+    #imported with legacy/ itself on sys.path
+    from graph_canvas import read_edges, compute_layout
+
+pg.setConfigOptions(useOpenGL=True, antialias=True)
+
+
+class DraggableGraphItem(pg.GraphItem):
+    """GraphItem whose nodes can be dragged; drags on empty space pan the view"""
+    def __init__(self, canvas):
+        super().__init__()
+        self.canvas = canvas
+        self._drag_index = None
+        self._drag_offset = (0.0, 0.0)
+
+    def mouseDragEvent(self, ev):
+        if ev.button() != Qt.LeftButton:
+            ev.ignore()
+            return
+
+        if ev.isStart():
+            down = ev.buttonDownPos()
+            points = self.scatter.pointsAt(down)
+            if len(points) == 0:
+                ev.ignore()
+                return
+            self._drag_index = points[0].index()
+            x, y = self.canvas.node_position(self._drag_index)
+            self._drag_offset = (x - down.x(), y - down.y())
+            self.canvas.start_drag(self._drag_index)
+        elif self._drag_index is None:
+            ev.ignore()
+            return
+
+        pos = ev.pos()
+        self.canvas.move_node(self._drag_index,
+                              pos.x() + self._drag_offset[0], pos.y() + self._drag_offset[1])
+        if ev.isFinish():
+            self.canvas.stop_drag()
+            self._drag_index = None
+        ev.accept()
+
+
+class PyQtGraphInteractiveGraph(pg.PlotWidget):
+    """Drop-in alternative to InteractiveGraph drawn by a single pyqtgraph GraphItem
+
+    Nodes and edges are rendered by Qt's scene graph (OpenGL when available)
+    instead of matplotlib Agg. Edges are drawn as plain lines, without arrowheads.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent, background='k')
+        self.hideAxis('left')
+        self.hideAxis('bottom')
+
+        self.graph = nx.DiGraph()
+        self.pos = {}
+        self.selected_node = None
+        self.dragging = False
+        self.hovered_node = None
+        self.node_labels = {}
+
+        self._nodes = []
+        self._pos_arr = np.empty((0, 2))
+        self._adj = np.empty((0, 2), dtype=int)
+        self._text_items = []
+
+        self._graph_item = DraggableGraphItem(self)
+        self.addItem(self._graph_item)
+        self.scene().sigMouseMoved.connect(self.on_mouse_moved)
+
+    def load_graph_from_csv(self, filename):
+        self.graph.clear()
+        self.pos = {}
+        self.node_labels = {}
+
+        try:
+            self.graph.add_edges_from(read_edges(filename))
+            self.node_labels = {node: node for node in self.graph.nodes}
+
+            if not self.graph.nodes:
+                raise ValueError("No valid edges found in the CSV file.")
+
+            self.apply_layout("spring")
+            return True
+        except Exception as e:
+            print(f"Error loading graph: {e}")
+            QMessageBox.warning(self.parent(), "Error",
+                                  f"Failed to load graph: {e}\n"
+                                  "Please check:\n"
+                                  "1. File is valid CSV format with at least two columns.\n"
+                                  "2. File encoding is UTF-8.")
+            return False
+
+    def apply_layout(self, layout_type):
+        if not self.graph.nodes:
+            return
+
+        self.pos = compute_layout(self.graph, layout_type, warm_pos=self.pos or None)
+        self._nodes = list(self.graph.nodes())
+        node_index = {node: i for i, node in enumerate(self._nodes)}
+        self._pos_arr = np.array([self.pos[n] for n in self._nodes], dtype=float)
+        self._adj = np.array([(node_index[u], node_index[v]) for u, v in self.graph.edges()],
+                             dtype=int).reshape(-1, 2)
+
+        for item in self._text_items:
+            self.removeItem(item)
+        self._text_items = []
+        for node in self._nodes:
+            item = pg.TextItem(str(self.node_labels.get(node, node)), color='w', anchor=(0.5, 0.5))
+            self.addItem(item)
+            self._text_items.append(item)
+
+        self.update_artists()
+        self.auto_scale()
+
+    def auto_scale(self):
+        self.plotItem.vb.autoRange(padding=0.1)
+
+    def update_artists(self):
+        """Push positions, colors and edges to the GraphItem in one setData call"""
+        brushes = [pg.mkBrush(self._node_color(node)) for node in self._nodes]
+        self._graph_item.setData(pos=self._pos_arr, adj=self._adj, size=30, pxMode=True,
+                                 symbol='o', symbolBrush=brushes, symbolPen=pg.mkPen('w'),
+                                 pen=pg.mkPen('#666666', width=1))
+        for item, (x, y) in zip(self._text_items, self._pos_arr):
+            item.setPos(x, y)
+
+        title = f"Nodes: {len(self.graph.nodes)} | Edges: {len(self.graph.edges)}"
+        if self.hovered_node is not None:
+            title += f" | Hovered: {self.hovered_node}"
+        self.setTitle(title, color='w', size='9pt')
+
+    def _node_color(self, node):
+        if node == self.selected_node: return '#aaaaaa'
+        if node == self.hovered_node: return '#cccccc'
+        return '#888888'
+
+    def get_node_at_position(self, pos):
+        points = self._graph_item.scatter.pointsAt(QPointF(*pos))
+        if len(points) == 0:
+            return None
+        return self._nodes[points[0].index()]
+
+    def node_position(self, index):
+        return tuple(self._pos_arr[index])
+
+    def start_drag(self, index):
+        self.dragging = True
+        self.selected_node = self._nodes[index]
+        self.update_artists()
+
+    def move_node(self, index, x, y):
+        self._pos_arr[index] = (x, y)
+        self.pos[self._nodes[index]] = (x, y)
+        self.update_artists()
+
+    def stop_drag(self):
+        self.dragging = False
+        self.selected_node = None
+        self.update_artists()
+
+    def on_mouse_moved(self, scene_pos):
+        if self.dragging or not self._nodes:
+            return
+        view_pos = self.plotItem.vb.mapSceneToView(scene_pos)
+        node = self.get_node_at_position((view_pos.x(), view_pos.y()))
+        if node != self.hovered_node:
+            self.hovered_node = node
+            self.update_artists()
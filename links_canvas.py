@@ -1,24 +1,92 @@
 # links_canvas.py
 import csv
-import networkx as nx
-import matplotlib.pyplot as plt
+import math
 import numpy as np
 from PyQt5.QtWidgets import QMessageBox
-from PyQt5.QtCore import Qt, QPoint
+from PyQt5.QtCore import Qt, QPoint, QTimer
 from PyQt5.QtGui import QCursor
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.patches import Circle, FancyArrowPatch
+from matplotlib.figure import Figure
+from matplotlib.collections import EllipseCollection, LineCollection
+from matplotlib.colors import to_rgba
+from matplotlib.transforms import IdentityTransform
+
+
+def _nearest_on_segment(px, py, sx, sy, ex, ey, margin):
+    """Point of the segment (sx, sy)-(ex, ey) nearest to (px, py), kept margin away from its ends"""
+    dx, dy = ex - sx, ey - sy
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return sx, sy
+    ux, uy = dx / length, dy / length
+    projection = max(0.0, min(length, (px - sx) * ux + (py - sy) * uy))
+    if projection < margin:
+        projection = margin
+    elif projection > length - margin:
+        projection = length - margin
+    return sx + projection * ux, sy + projection * uy
+
+
+def _arrow_side_point(x, y, fx, fy, tx, ty, qx, qy, offset):
+    """Point offset from (x, y) perpendicular to the arrow (fx, fy)->(tx, ty), on the side facing (qx, qy)"""
+    perp_angle = math.atan2(ty - fy, tx - fx) + math.pi / 2
+    target_angle = math.atan2(qy - y, qx - x)
+    side = 1 if abs((target_angle - perp_angle) % (2 * math.pi)) < math.pi / 2 else -1
+    return (x + offset * math.cos(perp_angle) * side,
+            y + offset * math.sin(perp_angle) * side)
+
+
+def read_links(filename):
+    """{id: {'from': x, 'to': y}} from the first two columns of a links CSV file
+
+    The header row is skipped, ids are data row numbers starting from 1 and
+    empty fields become None. Rows with non-integer values are dropped.
+    """
+    links = {}
+    with open(filename, 'r', encoding='utf-8') as csvfile:
+        reader = csv.reader(csvfile)
+        next(reader, None)  #skip header if exists
+        
+        for row_id, row in enumerate(reader, start=1):
+            if len(row) < 2:  #need at least 2 columns (from, to)
+                continue
+            
+            #try to parse from and to values
+            try:
+                from_val = int(row[0]) if row[0].strip() else None
+                to_val = int(row[1]) if row[1].strip() else None
+            except (ValueError, IndexError):
+                continue
+            
+            #link ids are the data row numbers, starting from 1
+            links[row_id] = {'from': from_val, 'to': to_val}
+    return links
+
 
 class InteractiveLinksCanvas(FigureCanvas):
+    #unit lemniscate of the self-link symbol, scaled and shifted per link
+    _LOOP_T = np.linspace(0, 2*np.pi, 100)
+    _LOOP_X = np.sin(_LOOP_T) / (1 + np.cos(_LOOP_T)**2)
+    _LOOP_Y = np.sin(_LOOP_T) * np.cos(_LOOP_T) / (1 + np.cos(_LOOP_T)**2)
+
     def __init__(self, parent=None):
-        plt.style.use('dark_background')
-        self.fig, self.ax = plt.subplots(figsize=(10, 8))
+        #a bare Figure stays out of pyplot's global figure registry and style state
+        self.fig = Figure(figsize=(10, 8), facecolor='#222222')
+        self.ax = self.fig.add_subplot(111)
         super().__init__(self.fig)
         self.setParent(parent)
 
         #links data
         self.links = {}  # {id: {'from': x, 'to': y}}
         self.link_positions = {}
+        #link_positions as one (N, 2) array for hit-testing, row i belongs to _pos_ids[i]
+        self._pos_array = np.empty((0, 2))
+        self._pos_ids = []
+        self._pos_row = {}
+        #squared hit-test radius in data units, dropped when the limits or the size change
+        self._r2 = None
+        #link_positions per layout type for the current links, dropped on load and after a drag
+        self._layout_memo = {}
         
         #visualization settings
         self.self_link_color = '#ff8888'
@@ -28,6 +96,8 @@ class InteractiveLinksCanvas(FigureCanvas):
         self.node_size = 0.15
         self.arrow_size = 15
         self.zoom_level = 1.0
+        self._base_xlim = None
+        self._base_ylim = None
         
         #interactive state
         self.selected_link = None
@@ -35,10 +105,40 @@ class InteractiveLinksCanvas(FigureCanvas):
         self.dragging = False
         self.pan_start = None
         self.pan_origin = None
-        
-        #artists
-        self.link_artists = {}
+        #axes pixels grabbed at pan start and how far they are shifted, see _blit_pan
+        self._pan_bg = None
+        self._pan_offset = (0, 0)
+        #latest motion event waiting for its hover hit-test, see on_motion
+        self._pending_hover = None
+        
+        #artists: one collection per kind of symbol instead of artists per link
+        self.line_collection = None  #arrow shafts and loop curves
+        self.head_collection = None  #arrowheads, sized in pixels
+        self.node_collection = None  #links drawn as circles
+        #animated (lines, heads, circles) holding only the hovered and selected links
+        self._highlight_artists = ()
         self.text_artists = {}
+        #'loop', 'arrow' or 'node' and the unhighlighted color of every link, set with its artists
+        self._link_type = {}
+        self._base_color = {}
+        #collection rows: loops and arrows share the line and head rows, circles have their own
+        self._line_ids = []
+        self._line_row = {}
+        self._node_ids = []
+        self._node_row = {}
+        #midpoints of arrow links used as arrow ends, and the links whose from/to is a given link
+        self._midpoint_cache = {}
+        self._referrers = {}
+        #geometry and base RGBA color of every row
+        self._segments = []
+        self._head_tails = np.empty((0, 2))
+        self._head_tips = np.empty((0, 2))
+        self._head_scale = np.empty(0)
+        self._centers = np.empty((0, 2))
+        self._line_rgba = np.empty((0, 4))
+        self._node_rgba = np.empty((0, 4))
+        #axes pixels without the highlighted links, grabbed after every full draw
+        self._bg = None
         
         self.ax.set_facecolor('#222222')
         self.fig.set_facecolor('#222222')
@@ -49,41 +149,28 @@ class InteractiveLinksCanvas(FigureCanvas):
         self.mpl_connect('button_release_event', self.on_release)
         self.mpl_connect('motion_notify_event', self.on_motion)
         self.mpl_connect('scroll_event', self.on_scroll)
+        self.mpl_connect('draw_event', self.on_draw)
+        self.mpl_connect('resize_event', self._on_view_changed)
+        self.ax.callbacks.connect('xlim_changed', self._on_view_changed)
+        self.ax.callbacks.connect('ylim_changed', self._on_view_changed)
         
 
     def load_links_from_csv(self, filename):
         self.links.clear()
         self.link_positions.clear()
+        self._layout_memo = {}
+        self._rebuild_pos_array()
         self.clear_artists()
         
         try:
-            with open(filename, 'r', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                next(reader, None)  #skip header if exists
-                
-                for row_id, row in enumerate(reader, start=1):
-                    if len(row) < 2:  #need at least 2 columns (from, to)
-                        continue
-                    
-                    #auto-generate link id starting from 1
-                    link_id = row_id
-                    
-                    #try to parse from and to values
-                    try:
-                        from_val = int(row[0]) if row[0].strip() else None
-                        to_val = int(row[1]) if row[1].strip() else None
-                    except (ValueError, IndexError):
-                        continue
-                    
-                    self.links[link_id] = {'from': from_val, 'to': to_val}
+            self.links.update(read_links(filename))
             
             if not self.links:
                 raise ValueError("No valid links found in CSV file")
             
+            #apply_layout already builds the artists
             self.apply_layout("spring")
-            self.create_artists()
             self.update_artists()
-            self.draw()
             return True
         
         except Exception as e:
@@ -100,178 +187,267 @@ class InteractiveLinksCanvas(FigureCanvas):
 
     def clear_artists(self):
         """Clear all artists from the canvas"""
-        for link_id in list(self.link_artists.keys()):
-            artist = self.link_artists[link_id]
-            if isinstance(artist, list):
-                for a in artist:
-                    a.remove()
-            else:
-                artist.remove()
-        self.link_artists.clear()
+        for collection in (self.line_collection, self.head_collection, self.node_collection,
+                           *self._highlight_artists):
+            if collection is not None:
+                collection.remove()
+        self.line_collection = self.head_collection = self.node_collection = None
+        self._highlight_artists = ()
+        self._link_type.clear()
+        self._base_color.clear()
+        self._line_ids, self._line_row = [], {}
+        self._node_ids, self._node_row = [], {}
+        self._midpoint_cache.clear()
+        self._referrers.clear()
         
         for artist in self.text_artists.values():
             artist.remove()
         self.text_artists.clear()
-        
-        self.ax.clear()
-        self.ax.axis('off')
+        self._bg = None
 
     def apply_layout(self, layout_type):
         """Apply the specified layout to the graph"""
         if not self.links:
             return
         
-        # Create a graph where links are nodes and references are edges
+        if layout_type in self._layout_memo:
+            self.link_positions = dict(self._layout_memo[layout_type])
+        else:
+            self.link_positions = self._compute_layout(layout_type)
+            self._layout_memo[layout_type] = dict(self.link_positions)
+        self._rebuild_pos_array()
+        
+        self.clear_artists()
+        self.create_artists()
+        self.reset_view()
+
+    def _compute_layout(self, layout_type):
+        """Positions of the links under layout_type, with links as nodes and references as edges"""
+        #networkx is only needed once links are laid out, not at startup
+        import networkx as nx
+        
         G = nx.DiGraph()
         G.add_nodes_from(self.links.keys())
+        links = self.links
+        G.add_edges_from([(link_data['from'], link_id) for link_id, link_data in links.items()
+                          if link_data['from'] in links])
+        G.add_edges_from([(link_id, link_data['to']) for link_id, link_data in links.items()
+                          if link_data['to'] in links])
         
-        for link_id, link_data in self.links.items():
-            if link_data['from'] in self.links:
-                G.add_edge(link_data['from'], link_id)
-            if link_data['to'] in self.links:
-                G.add_edge(link_id, link_data['to'])
-        
-        # Calculate layout with try-except for fallback
+        # Calculate only the requested layout, with try-except for fallback
         try:
             layouts = {
-                "spring": nx.spring_layout(G, k=0.5, iterations=100),
-                "circular": nx.circular_layout(G),
-                "random": nx.random_layout(G),
-                "kamada_kawai": nx.kamada_kawai_layout(G),
-                "spectral": nx.spectral_layout(G)
+                "spring": lambda: nx.spring_layout(G, k=0.5, iterations=100),
+                "circular": lambda: nx.circular_layout(G),
+                "random": lambda: nx.random_layout(G),
+                "kamada_kawai": lambda: self._layout_by_component(G, nx.kamada_kawai_layout),
+                "spectral": lambda: self._layout_by_component(G, nx.spectral_layout)
             }
-            self.link_positions = layouts.get(layout_type, nx.spring_layout(G))
+            return layouts.get(layout_type, lambda: nx.spring_layout(G))()
         except Exception as e:
             print(f"Error applying {layout_type} layout: {e}")
-            self.link_positions = nx.spring_layout(G)
-        
-        self.clear_artists()
-        self.create_artists()
-        self.reset_view()
+            return nx.spring_layout(G)
+
+    def _layout_by_component(self, G, layout_fn):
+        """Run layout_fn on every weakly connected component of G and pack the results
+
+        kamada_kawai and spectral give degenerate positions for disconnected graphs,
+        so each component is laid out alone and scaled by its size. The largest one
+        keeps the usual [-1, 1] extent, the rest are placed in rows next to it.
+        """
+        import networkx as nx
+        
+        if nx.number_weakly_connected_components(G) < 2:
+            return layout_fn(G)
+        
+        components = sorted(nx.weakly_connected_components(G), key=len, reverse=True)
+        largest = len(components[0])
+        scales = [math.sqrt(len(nodes) / largest) for nodes in components]
+        #side of the square each component occupies, with room for the link symbols
+        sizes = [2 * scale + 2 * self.node_size for scale in scales]
+        row_width = max(sizes[0], math.sqrt(sum(size * size for size in sizes)))
+        
+        pos = {}
+        x = y = row_height = 0.0
+        for nodes, scale, size in zip(components, scales, sizes):
+            if x > 0 and x + size > row_width:
+                x, y, row_height = 0.0, y - row_height, 0.0
+            cx, cy = x + size / 2, y - size / 2
+            sub_pos = nx.rescale_layout_dict(layout_fn(G.subgraph(nodes)), scale=scale)
+            for node, (px, py) in sub_pos.items():
+                pos[node] = (cx + px, cy + py)
+            x += size
+            row_height = max(row_height, size)
+        return pos
+
+    def _rebuild_pos_array(self):
+        """Mirror link_positions into the arrays used by _get_link_at_position"""
+        self._pos_ids = list(self.link_positions)
+        self._pos_row = {link_id: i for i, link_id in enumerate(self._pos_ids)}
+        self._pos_array = np.array([self.link_positions[link_id] for link_id in self._pos_ids],
+                                   dtype=float).reshape(-1, 2)
 
     def create_artists(self):
+        """Build the link collections, every link is a row in one of them"""
         for link_id in self.links:
             self._create_link_artist(link_id)
+        
+        self._segments = [None] * len(self._line_ids)
+        self._head_tails = np.zeros((len(self._line_ids), 2))
+        self._head_tips = np.zeros((len(self._line_ids), 2))
+        self._head_scale = np.array([0.8 if self._link_type[link_id] == 'loop' else 1.0
+                                     for link_id in self._line_ids])
+        self._centers = np.zeros((len(self._node_ids), 2))
+        for link_id in self.links:
+            self._set_link_geometry(link_id)
+        self._line_rgba = np.array([to_rgba(self._base_color[link_id]) for link_id in self._line_ids]).reshape(-1, 4)
+        #alpha is per row, a collection-wide alpha would override the hidden dragged row
+        self._node_rgba = np.array([to_rgba(self._base_color[link_id], 0.9) for link_id in self._node_ids]).reshape(-1, 4)
+        
+        self.line_collection, self.head_collection, self.node_collection = self._make_collections()
+        self.line_collection.set_segments(self._segments)
+        self.line_collection.set_color(self._line_rgba)
+        self.head_collection.set_offsets(self._head_tips)
+        self.head_collection.set_color(self._line_rgba)
+        self.node_collection.set_offsets(self._centers)
+        self.node_collection.set_facecolor(self._node_rgba)
+        self._highlight_artists = self._make_collections(animated=True)
+        for collection in (self.line_collection, self.head_collection, self.node_collection,
+                           *self._highlight_artists):
+            self.ax.add_collection(collection, autolim=False)
+        self._update_heads()
+
+    def _make_collections(self, animated=False):
+        """пустые коллекции линий, наконечников и кругов"""
+        lines = LineCollection([], linewidths=2, capstyle='round', zorder=1, animated=animated)
+        #наконечники задаются в пикселях относительно острия стрелки
+        heads = LineCollection([], linewidths=2, capstyle='round', zorder=1, animated=animated,
+                               offsets=np.empty((0, 2)), offset_transform=self.ax.transData)
+        heads.set_transform(IdentityTransform())
+        circles = EllipseCollection(self.node_size, self.node_size, 0, units='xy',
+                                    offsets=np.empty((0, 2)), offset_transform=self.ax.transData,
+                                    edgecolors=to_rgba('white', 0.9), linewidths=1, zorder=2,
+                                    animated=animated)
+        return lines, heads, circles
 
     def _create_link_artist(self, link_id):
-        """графический элемент связи"""
+        """тип, цвет и строка коллекции для связи"""
         link_data = self.links[link_id]
         from_id = link_data['from']
         to_id = link_data['to']
-        pos = self.link_positions.get(link_id, (0, 0))
         
         #самозамкнутая связь
         if from_id == link_id and to_id == link_id:
-            artist = self._draw_self_link(link_id, pos[0], pos[1])
+            link_type = 'loop'
         #обычная связь между элементами
         elif from_id is not None and to_id is not None:
-            artist = self._draw_regular_link(link_id, from_id, to_id)
+            link_type = 'arrow'
         #связь как узел
         else:
-            artist = self._draw_link_as_node(link_id, pos[0], pos[1])
+            link_type = 'node'
         
-        self.link_artists[link_id] = artist
-
-    def _draw_self_link(self, link_id, x, y):
-        """символ бесконечности в самозамкнутой связи"""
-        t = np.linspace(0, 2*np.pi, 100)
-        a = self.node_size * 0.7
-        x_loop = a * np.sin(t) / (1 + np.cos(t)**2)
-        y_loop = a * np.sin(t) * np.cos(t) / (1 + np.cos(t)**2)
-        x_loop += x
-        y_loop += y
+        self._link_type[link_id] = link_type
+        self._base_color[link_id] = self.self_link_color if from_id == to_id else self.link_color
         
-        #основная линия
-        loop = self.ax.plot(x_loop, y_loop, color=self.self_link_color, 
-                        lw=2, zorder=2, solid_capstyle='round')[0]
+        for ref_id in {from_id, to_id}:
+            self._referrers.setdefault(ref_id, []).append(link_id)
         
-        #стрелка на петле
-        arrow_idx = -20  #индекс точки для стрелки
-        arrow = FancyArrowPatch(
-            (x_loop[arrow_idx], y_loop[arrow_idx]),
-            (x_loop[arrow_idx+1], y_loop[arrow_idx+1]),
-            arrowstyle='->', color=self.self_link_color,
-            mutation_scale=self.arrow_size*0.8, lw=2, zorder=3
-        )
-        self.ax.add_patch(arrow)
+        if link_type == 'node':
+            self._node_row[link_id] = len(self._node_ids)
+            self._node_ids.append(link_id)
+        else:
+            self._line_row[link_id] = len(self._line_ids)
+            self._line_ids.append(link_id)
+
+    def _set_link_geometry(self, link_id):
+        """линия, стрелка или центр круга связи по текущим позициям"""
+        link_type = self._link_type[link_id]
+        pos = self.link_positions.get(link_id, (0, 0))
+        if link_type == 'node':
+            self._centers[self._node_row[link_id]] = pos
+            return
         
-        # Возвращаем список художников
-        return [loop, arrow]
+        row = self._line_row[link_id]
+        if link_type == 'loop':
+            #символ бесконечности, стрелка на петле
+            x_loop, y_loop, arrow_start, arrow_end = self._self_link_geometry(pos[0], pos[1])
+            self._segments[row] = np.column_stack((x_loop, y_loop))
+        else:
+            link_data = self.links[link_id]
+            arrow_start, arrow_end = self._regular_link_ends(link_data['from'], link_data['to'])
+            self._segments[row] = np.array((arrow_start, arrow_end), dtype=float)
+        self._head_tails[row] = arrow_start
+        self._head_tips[row] = arrow_end
+
+    def _head_vertices(self, rows):
+        """(K, 3, 2) pixel offsets from the tip of the '->' heads of the given line rows
+
+        Heads keep a fixed size on screen, like a FancyArrowPatch with
+        mutation_scale arrow_size (0.8 of it for loops).
+        """
+        tails = self.ax.transData.transform(self._head_tails[rows])
+        tips = self.ax.transData.transform(self._head_tips[rows])
+        d = tips - tails
+        length = np.hypot(d[:, 0], d[:, 1])
+        length[length == 0] = np.inf
+        ux, uy = d[:, 0] / length, d[:, 1] / length
+        points = self.arrow_size * self._head_scale[rows] * self.fig.dpi / 72
+        head_length, head_width = 0.4 * points, 0.2 * points
+        verts = np.zeros((len(tips), 3, 2))
+        verts[:, 0, 0] = -ux * head_length - uy * head_width
+        verts[:, 0, 1] = -uy * head_length + ux * head_width
+        verts[:, 2, 0] = -ux * head_length + uy * head_width
+        verts[:, 2, 1] = -uy * head_length - ux * head_width
+        return verts
 
-    def _draw_regular_link(self, link_id, from_id, to_id):
-        """соединения между всеми видами связи"""
+    def _update_heads(self):
+        """Re-aim the arrowheads, their screen direction depends on the limits and the size"""
+        if self.head_collection is not None:
+            self.head_collection.set_segments(self._head_vertices(np.arange(len(self._line_ids))))
+            self._update_highlight()
+
+    def draw(self):
+        #heads are in pixels, so they are re-aimed right before every full render
+        self._update_heads()
+        super().draw()
+
+    def _self_link_geometry(self, x, y):
+        """кривая петли с центром (x, y) и концы стрелки на ней"""
+        a = self.node_size * 0.7
+        x_loop = a * self._LOOP_X + x
+        y_loop = a * self._LOOP_Y + y
+        arrow_idx = -20  #индекс точки для стрелки
+        return (x_loop, y_loop, (x_loop[arrow_idx], y_loop[arrow_idx]),
+                (x_loop[arrow_idx+1], y_loop[arrow_idx+1]))
+
+    def _regular_link_ends(self, from_id, to_id):
+        """начало и конец стрелки обычной связи"""
         #получаем базовые позиции
         start_pos = self.link_positions.get(from_id, (0, 0))
         end_pos = self.link_positions.get(to_id, (0, 0))
         
         #корректируем начальную точку если рисуем ОТ стрелки
         if from_id in self.links and self.links[from_id]['from'] != self.links[from_id]['to']:
-            src_from = self.link_positions.get(self.links[from_id]['from'], (0, 0))
-            src_to = self.link_positions.get(self.links[from_id]['to'], (0, 0))
-            start_pos = (
-                (src_from[0] + src_to[0]) / 2,
-                (src_from[1] + src_to[1]) / 2
-            )
+            start_pos = self._midpoint(from_id)
         
         #корректируем конечную точку если рисуем К стрелке
         if to_id in self.links and self.links[to_id]['from'] != self.links[to_id]['to']:
-            tgt_from = self.link_positions.get(self.links[to_id]['from'], (0, 0))
-            tgt_to = self.link_positions.get(self.links[to_id]['to'], (0, 0))
-            end_pos = (
-                (tgt_from[0] + tgt_to[0]) / 2,
-                (tgt_from[1] + tgt_to[1]) / 2
-            )
-        
-        #рисуем стрелку
-        arrow = FancyArrowPatch(
-            start_pos, end_pos,
-            arrowstyle='->', color=self.link_color,
-            mutation_scale=self.arrow_size, lw=2, zorder=1
-        )
-        self.ax.add_patch(arrow)
-        return arrow
+            end_pos = self._midpoint(to_id)
+        return start_pos, end_pos
+
+    def _midpoint(self, link_id):
+        """середина стрелки link_id, запоминается до перемещения её концов"""
+        mid = self._midpoint_cache.get(link_id)
+        if mid is None:
+            src = self.link_positions.get(self.links[link_id]['from'], (0, 0))
+            dst = self.link_positions.get(self.links[link_id]['to'], (0, 0))
+            mid = self._midpoint_cache[link_id] = ((src[0] + dst[0]) / 2, (src[1] + dst[1]) / 2)
+        return mid
 
     def _get_nearest_point_on_line(self, point, line_start, line_end):
         """нахождение ближайшей точки на отрезке для заданной точки"""
-        #вектор отрезка
-        line_vec = np.array([line_end[0] - line_start[0], line_end[1] - line_start[1]])
-        #вектор от начала отрезка до точки
-        point_vec = np.array([point[0] - line_start[0], point[1] - line_start[1]])
-        
-        #длина отрезка
-        line_len = np.linalg.norm(line_vec)
-        if line_len == 0:
-            return line_start
-        
-        #нормализованный вектор направления
-        line_dir = line_vec / line_len
-        
-        #проекция point_vec на line_dir
-        projection = np.dot(point_vec, line_dir)
-        
-        #ограничиваем проекцию в пределах отрезка
-        projection = max(0, min(line_len, projection))
-        
-        #вычисляем ближайшую точку
-        nearest_point = line_start + projection * line_dir
-        
-        #смещаем немного от краев для лучшего вида
-        if projection < self.arrow_size * 0.5:
-            nearest_point = line_start + self.arrow_size * 0.5 * line_dir
-        elif projection > line_len - self.arrow_size * 0.5:
-            nearest_point = line_end - self.arrow_size * 0.5 * line_dir
-        
-        return nearest_point
-
-    def _draw_link_as_node(self, link_id, x, y):
-        """связь как узел (просто круг)"""
-        circle = Circle(
-            (x, y), self.node_size/2,
-            facecolor=self.link_color, edgecolor='white',
-            linewidth=1, alpha=0.9, zorder=2
-        )
-        self.ax.add_patch(circle)
-        return circle
+        return _nearest_on_segment(point[0], point[1], line_start[0], line_start[1],
+                                   line_end[0], line_end[1], self.arrow_size * 0.5)
 
     def _get_link_type(self, link_id):
         """определения типа связи"""
@@ -286,7 +462,7 @@ class InteractiveLinksCanvas(FigureCanvas):
         """точка на краю круга"""
         dx = target_pos[0] - node_pos[0]
         dy = target_pos[1] - node_pos[1]
-        dist = max(0.001, np.hypot(dx, dy))
+        dist = max(0.001, math.hypot(dx, dy))
         factor = 0.5 if outward else -0.5
         return (
             node_pos[0] + dx * self.node_size * factor / dist,
@@ -295,12 +471,12 @@ class InteractiveLinksCanvas(FigureCanvas):
 
     def _get_loop_connection_point(self, loop_pos, target_pos, outward=True):
         """точка соединения на петле (символ ∞)"""
-        angle = np.arctan2(target_pos[1] - loop_pos[1], target_pos[0] - loop_pos[0])
+        angle = math.atan2(target_pos[1] - loop_pos[1], target_pos[0] - loop_pos[0])
         loop_size = self.node_size * 0.7
         factor = 0.7 if outward else -0.7
         return (
-            loop_pos[0] + loop_size * np.cos(angle) * factor,
-            loop_pos[1] + loop_size * np.sin(angle) * factor
+            loop_pos[0] + loop_size * math.cos(angle) * factor,
+            loop_pos[1] + loop_size * math.sin(angle) * factor
         )
 
     def _get_arrow_connection_point(self, arrow_id, arrow_pos, target_pos, outward=True):
@@ -310,47 +486,76 @@ class InteractiveLinksCanvas(FigureCanvas):
         from_pos = self.link_positions.get(arrow_data['from'], (0, 0))
         to_pos = self.link_positions.get(arrow_data['to'], (0, 0))
         
-        #определяем направление исходной стрелки
-        dx = to_pos[0] - from_pos[0]
-        dy = to_pos[1] - from_pos[1]
-        angle = np.arctan2(dy, dx)
-        
-        # перпендикулярное направление
-        perp_angle = angle + np.pi/2
+        #сторона перпендикуляра к стрелке, обращённая к target_pos
+        return _arrow_side_point(arrow_pos[0], arrow_pos[1], from_pos[0], from_pos[1],
+                                 to_pos[0], to_pos[1], target_pos[0], target_pos[1],
+                                 self.node_size * 0.3)
+
+    def update_artists(self, changed_links=None):
+        """Update visual properties based on interaction state
+
+        The hovered and selected links are copied into the animated highlight
+        collections. When only the highlight of changed_links differs, those are
+        blitted over the cached background instead of redrawing the whole canvas.
+        """
+        if self.line_collection is None:
+            return
+        self._update_highlight()
         
-        # выбираем сторону соединения в зависимости от target_pos
-        target_angle = np.arctan2(target_pos[1] - arrow_pos[1], target_pos[0] - arrow_pos[0])
-        side = 1 if abs((target_angle - perp_angle) % (2*np.pi)) < np.pi/2 else -1
+        if changed_links is not None and self._bg is not None:
+            self._blit()
+            return
         
-        # смещение от центра стрелки
-        offset = self.node_size * 0.3
-        return (
-            arrow_pos[0] + offset * np.cos(perp_angle) * side,
-            arrow_pos[1] + offset * np.sin(perp_angle) * side
-        )
+        line_rgba, node_rgba = self._line_rgba, self._node_rgba
+        #the dragged link moves every frame, so it is left out of the background
+        if self.dragging and self.selected_link in self._line_row:
+            line_rgba = line_rgba.copy()
+            line_rgba[self._line_row[self.selected_link], 3] = 0
+        elif self.dragging and self.selected_link in self._node_row:
+            node_rgba = node_rgba.copy()
+            node_rgba[self._node_row[self.selected_link], 3] = 0
+        self.line_collection.set_segments(self._segments)
+        self.line_collection.set_color(line_rgba)
+        self.head_collection.set_offsets(self._head_tips)
+        self.head_collection.set_color(line_rgba)
+        self.node_collection.set_offsets(self._centers)
+        self.node_collection.set_facecolor(node_rgba)
+        self.node_collection.set_edgecolor(np.where(node_rgba[:, 3:] > 0, to_rgba('white', 0.9), 0))
+        self.draw_idle()
 
-    def update_artists(self):
-        """Update visual properties based on interaction state"""
-        for link_id, artist in self.link_artists.items():
-            color = self.self_link_color if self.links[link_id]['from'] == self.links[link_id]['to'] else self.link_color
-            
-            if link_id == self.hovered_link or link_id == self.selected_link:
-                color = self.highlight_color
-            
-            # Handle both single artists and lists of artists (for self-links)
-            if isinstance(artist, (list, tuple)):
-                for a in artist:
-                    if hasattr(a, 'set_color'):
-                        a.set_color(color)
-                    elif hasattr(a, 'set_facecolor'):  # for circles
-                        a.set_facecolor(color)
-            else:
-                if hasattr(artist, 'set_color'):
-                    artist.set_color(color)
-                elif hasattr(artist, 'set_facecolor'):  #for circles
-                    artist.set_facecolor(color)
-        
-        self.draw()
+    def _update_highlight(self):
+        """Put the hovered and selected links into the highlight collections"""
+        highlighted = [link_id for link_id in dict.fromkeys((self.hovered_link, self.selected_link))
+                       if link_id in self._link_type]
+        line_rows = [self._line_row[link_id] for link_id in highlighted if link_id in self._line_row]
+        node_rows = [self._node_row[link_id] for link_id in highlighted if link_id in self._node_row]
+        
+        lines, heads, circles = self._highlight_artists
+        lines.set_segments([self._segments[row] for row in line_rows])
+        lines.set_color(self.highlight_color)
+        heads.set_offsets(self._head_tips[line_rows])
+        heads.set_segments(self._head_vertices(line_rows))
+        heads.set_color(self.highlight_color)
+        circles.set_offsets(self._centers[node_rows])
+        circles.set_facecolor(to_rgba(self.highlight_color, 0.9))
+
+    def on_draw(self, event):
+        """Keep the freshly drawn links without highlights for blitting, then draw the highlights"""
+        self._bg = self.copy_from_bbox(self.ax.bbox)
+        for collection in self._highlight_artists:
+            self.ax.draw_artist(collection)
+
+    def _blit(self):
+        """Restore the background and redraw only the highlighted links"""
+        self.restore_region(self._bg)
+        for collection in self._highlight_artists:
+            self.ax.draw_artist(collection)
+        self.blit(self.ax.bbox)
+
+    def _on_view_changed(self, *args):
+        """The limits or the canvas size changed, so the cached pixels and hit radius no longer fit"""
+        self._bg = None
+        self._r2 = None
 
     def reset_view(self):
         """Reset view to fit all links"""
@@ -369,24 +574,29 @@ class InteractiveLinksCanvas(FigureCanvas):
         x_padding = max(0.2, (x_max - x_min) * 0.2)
         y_padding = max(0.2, (y_max - y_min) * 0.2)
         
-        self.ax.set_xlim(x_min - x_padding, x_max + x_padding)
-        self.ax.set_ylim(y_min - y_padding, y_max + y_padding)
+        #limits at zoom level 1.0, set_zoom scales these instead of the current ones
+        self._base_xlim = (x_min - x_padding, x_max + x_padding)
+        self._base_ylim = (y_min - y_padding, y_max + y_padding)
+        self.ax.set_xlim(self._base_xlim)
+        self.ax.set_ylim(self._base_ylim)
         self.zoom_level = 1.0
-        self.draw()
+        self.draw_idle()
 
     def set_zoom(self, zoom_level):
-        """Set zoom level while maintaining center"""
+        """Zoom to zoom_level relative to the view reset_view fits, keeping the current center"""
+        if self._base_xlim is None:
+            return
         xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
         center_x = (xlim[0] + xlim[1]) / 2
         center_y = (ylim[0] + ylim[1]) / 2
         
-        width = (xlim[1] - xlim[0]) / zoom_level
-        height = (ylim[1] - ylim[0]) / zoom_level
+        width = (self._base_xlim[1] - self._base_xlim[0]) / zoom_level
+        height = (self._base_ylim[1] - self._base_ylim[0]) / zoom_level
         
         self.ax.set_xlim(center_x - width/2, center_x + width/2)
         self.ax.set_ylim(center_y - height/2, center_y + height/2)
         self.zoom_level = zoom_level
-        self.draw()
+        self.draw_idle()
 
     
     def on_press(self, event):
@@ -401,72 +611,101 @@ class InteractiveLinksCanvas(FigureCanvas):
             if clicked_link:
                 self.selected_link = clicked_link
                 self.dragging = True
+                #full redraw, the dragged link must not be part of the background
+                self._bg = None
                 self.update_artists()
             else:
                 # start panning
                 self.pan_start = QPoint(event.x, event.y)
                 self.pan_origin = (self.ax.get_xlim(), self.ax.get_ylim())
+                self._pan_bg = self.copy_from_bbox(self.ax.bbox)
+                self._pan_offset = (0, 0)
                 self.setCursor(QCursor(Qt.ClosedHandCursor))
 
     def on_release(self, event):
         """Handle mouse release events"""
         if event.button == 1:  #left mouse button
+            if self.dragging:
+                #the dragged positions no longer match any computed layout
+                self._layout_memo = {}
+            if self.pan_start and self._pan_offset != (0, 0):
+                self._apply_pan(*self._pan_offset)
+            released_link = self.selected_link
+            was_dragging = self.dragging
             self.dragging = False
             self.selected_link = None
             self.pan_start = None
             self.pan_origin = None
+            self._pan_bg = None
             self.setCursor(QCursor(Qt.ArrowCursor))
-            self.update_artists()
+            #a dragged link goes back into the background with a full redraw
+            self.update_artists(changed_links=None if was_dragging else [released_link])
 
     def on_motion(self, event):
         """Handle mouse motion events"""
         if event.inaxes != self.ax:
             #handle hover off
-            if self.hovered_link:
-                self.hovered_link = None
-                self.update_artists()
+            self._queue_hover(event)
             return
     
         #handle panning
         if self.pan_start and event.button == 1:
-            if event.xdata is None or event.ydata is None:
-                return
-            
-            dx_pixels = event.x - self.pan_start.x()
-            dy_pixels = event.y - self.pan_start.y()
-
-            xlim_current, ylim_current = self.ax.get_xlim(), self.ax.get_ylim()
-            fig_width, fig_height = self.fig.get_size_inches()
-            dpi = self.fig.dpi
-        
-            if fig_width == 0 or fig_height == 0:
-                return
-            
-            x_data_per_pixel = (xlim_current[1] - xlim_current[0]) / (fig_width * dpi)
-            y_data_per_pixel = (ylim_current[1] - ylim_current[0]) / (fig_height * dpi)
-        
-            dx_data = dx_pixels * x_data_per_pixel
-            dy_data = dy_pixels * y_data_per_pixel
-
-            new_xlim = (self.pan_origin[0][0] - dx_data, self.pan_origin[0][1] - dx_data)
-            new_ylim = (self.pan_origin[1][0] + dy_data, self.pan_origin[1][1] + dy_data)
-        
-            self.ax.set_xlim(new_xlim)
-            self.ax.set_ylim(new_ylim)
-            self.fig.canvas.draw_idle()
+            #the limits are only changed on release, until then the pan is a shifted blit
+            self._pan_offset = (event.x - self.pan_start.x(), event.y - self.pan_start.y())
+            self._blit_pan(*self._pan_offset)
             return
     
-        #handle hover
-        hovered_link = self._get_link_at_position((event.xdata, event.ydata))
-        if hovered_link != self.hovered_link:
-            self.hovered_link = hovered_link
-            self.update_artists()
+        #handle hover, at most once per frame
+        self._queue_hover(event)
     
         #handle dragging
         if self.dragging and self.selected_link and event.xdata is not None and event.ydata is not None:
             self.link_positions[self.selected_link] = (event.xdata, event.ydata)
+            self._pos_array[self._pos_row[self.selected_link]] = (event.xdata, event.ydata)
             self._update_link_artist(self.selected_link)
-            self.fig.canvas.draw_idle()
+            self.update_artists(changed_links=[self.selected_link])
+
+    #the legacy graph canvas pans the same way with its own copy: legacy/ is imported
+    #with only its own directory on sys.path and the viewer does not import it
+    def _blit_pan(self, dx, dy):
+        """Preview a pan without redrawing: the links as they were on press, moved by the mouse offset"""
+        if self._pan_bg is None:
+            return
+        #figure color for the strip the shifted links uncover
+        self.fig.draw_artist(self.fig.patch)
+        #restore_region takes buffer coordinates, where y grows downward
+        left, top, _, _ = self._pan_bg.get_extents()
+        self.restore_region(self._pan_bg, xy=(left + dx, top - dy))
+        self.blit(self.ax.bbox)
+
+    def _apply_pan(self, dx, dy):
+        """Set the limits the pan preview showed, with the mouse offset converted to data units"""
+        (x_min, x_max), (y_min, y_max) = self.pan_origin
+        width, height = self.ax.bbox.width, self.ax.bbox.height
+        if not width or not height:
+            return
+        shift_x = dx * (x_max - x_min) / width
+        shift_y = dy * (y_max - y_min) / height
+        self.ax.set_xlim(x_min - shift_x, x_max - shift_x)
+        self.ax.set_ylim(y_min - shift_y, y_max - shift_y)
+
+    def _queue_hover(self, event):
+        """Coalesce hover hit-tests so at most one runs per ~16 ms frame"""
+        if self._pending_hover is None:
+            QTimer.singleShot(16, self._apply_pending_hover)
+        self._pending_hover = event
+
+    def _apply_pending_hover(self):
+        event, self._pending_hover = self._pending_hover, None
+        if event is None:
+            return
+        if event.inaxes != self.ax:
+            hovered_link = None
+        else:
+            hovered_link = self._get_link_at_position((event.xdata, event.ydata))
+        if hovered_link != self.hovered_link:
+            old_link, self.hovered_link = self.hovered_link, hovered_link
+            self.update_artists(changed_links=[old_link, hovered_link])
 
     def on_scroll(self, event):
         """Handle scroll events for zooming"""
@@ -489,53 +728,47 @@ class InteractiveLinksCanvas(FigureCanvas):
 
     def _get_link_at_position(self, pos):
         """Find which link is at given position (x,y)"""
-        if not pos[0] or not pos[1]:
+        if pos[0] is None or pos[1] is None:
             return None
         
-        x, y = pos
-        xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
-    
-        if (xlim[1] - xlim[0]) == 0 or (ylim[1] - ylim[0]) == 0:
+        if not self._pos_ids:
             return None
-        
-        fig_width, fig_height = self.fig.get_size_inches()
-        dpi = self.fig.dpi
-        x_data_per_inch = (xlim[1] - xlim[0]) / fig_width
-        y_data_per_inch = (ylim[1] - ylim[0]) / fig_height
-        node_radius = 15.0 / dpi * ((x_data_per_inch + y_data_per_inch) / 2)
-    
-        for link_id, (lx, ly) in self.link_positions.items():
-            if ((lx - x)**2 + (ly - y)**2) <= node_radius**2:
-                return link_id
+        x, y = pos
+        d2 = (self._pos_array[:, 0] - x)**2 + (self._pos_array[:, 1] - y)**2
+        i = d2.argmin()
+        if d2[i] <= self._get_r2():
+            return self._pos_ids[i]
         return None
 
+    def _get_r2(self):
+        """Squared data-space radius of the 15 px hit area around a link"""
+        if self._r2 is None:
+            xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
+            if (xlim[1] - xlim[0]) == 0 or (ylim[1] - ylim[0]) == 0:
+                #degenerate view, nothing can be hit
+                self._r2 = -1.0
+                return self._r2
+            
+            fig_width, fig_height = self.fig.get_size_inches()
+            dpi = self.fig.dpi
+            x_data_per_inch = (xlim[1] - xlim[0]) / fig_width
+            y_data_per_inch = (ylim[1] - ylim[0]) / fig_height
+            node_radius = 15.0 / dpi * ((x_data_per_inch + y_data_per_inch) / 2)
+            self._r2 = node_radius**2
+        return self._r2
+
     def _update_link_artist(self, link_id):
         """Update visual representation of a single link"""
-        if link_id not in self.link_artists:
+        if link_id not in self._link_type:
             return
         
-        #remove old artist(s)
-        artist = self.link_artists[link_id]
-        if isinstance(artist, list):
-            for a in artist:
-                a.remove()
-        else:
-            artist.remove()
-        
-        link_data = self.links[link_id]
-        from_id = link_data['from']
-        to_id = link_data['to']
+        #arrows starting or ending at the moved link have a new midpoint
+        self._midpoint_cache.pop(link_id, None)
+        for ref_id in self._referrers.get(link_id, ()):
+            self._midpoint_cache.pop(ref_id, None)
         
-        # create new artist at updated position
-        if from_id == to_id == link_id:  # self-link (loop)
-            loop, arrow = self._draw_self_link(link_id, *self.link_positions[link_id])
-            self.link_artists[link_id] = [loop, arrow]
-        elif from_id is not None and to_id is not None:  # regular link
-            new_artist = self._draw_regular_link(link_id, from_id, to_id)
-            self.link_artists[link_id] = new_artist
-        else:  # link as node
-            new_artist = self._draw_link_as_node(link_id, *self.link_positions[link_id])
-            self.link_artists[link_id] = new_artist
+        #new geometry reaches the collections on the next full update_artists
+        self._set_link_geometry(link_id)
         
         # update text position if exists
         if link_id in self.text_artists:
@@ -553,7 +786,7 @@ class InteractiveLinksCanvas(FigureCanvas):
             x1, y1 = source_pos
             angles = []
             for side, (x2, y2) in self.connection_points.items():
-                angle = np.arctan2(y2 - y1, x2 - x1)
+                angle = math.atan2(y2 - y1, x2 - x1)
                 angles.append((angle, (x2, y2)))
         
             #find the point with most direct angle
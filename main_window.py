@@ -1,7 +1,7 @@
 # main_window.py
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QLabel, QComboBox, QPushButton, QFileDialog, QSlider)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from links_canvas import InteractiveLinksCanvas
 
 class LinksViewer(QMainWindow):
@@ -10,6 +10,10 @@ class LinksViewer(QMainWindow):
         self.setWindowTitle("Interactive Links Viewer")
         self.setGeometry(100, 100, 1000, 800)
 
+        #latest slider value waiting to be applied, see adjust_zoom
+        self._pending_zoom_value = None
+        self._zoom_timer_armed = False
+
         self.setStyleSheet("""
             QMainWindow { background-color: #222222; }
             QLabel, QPushButton, QSlider { color: #dddddd; }
@@ -54,6 +58,7 @@ class LinksViewer(QMainWindow):
         self.zoom_slider.setRange(10, 200)
         self.zoom_slider.setValue(100)
         self.zoom_slider.valueChanged.connect(self.adjust_zoom)
+        self.zoom_slider.sliderReleased.connect(self._apply_zoom_now)
         control_layout.addWidget(self.zoom_slider)
 
         reset_zoom_btn = QPushButton("Reset View")
@@ -90,7 +95,17 @@ class LinksViewer(QMainWindow):
         self.zoom_slider.setValue(100)
 
     def adjust_zoom(self, value):
-        self.links_canvas.set_zoom(value / 100.0)
+        """Debounce slider ticks so only the latest value within 20 ms is rendered"""
+        self._pending_zoom_value = value
+        if not self._zoom_timer_armed:
+            self._zoom_timer_armed = True
+            QTimer.singleShot(20, self._apply_zoom_now)
+
+    def _apply_zoom_now(self):
+        self._zoom_timer_armed = False
+        value, self._pending_zoom_value = self._pending_zoom_value, None
+        if value is not None:
+            self.links_canvas.set_zoom(value / 100.0)
 
     def reset_view(self):
         self.links_canvas.reset_view()